@@ -3,7 +3,9 @@ import logging
 from flask import Flask, render_template, request, jsonify
 from werkzeug.middleware.proxy_fix import ProxyFix
 from sms_service import SMSService
-from utils import validate_phone_numbers, parse_csv_content, clean_phone_number, parse_phone_numbers_from_input
+from scheduler import SMSPriority
+from utils import (validate_phone_numbers, parse_csv_content, clean_phone_number, parse_phone_numbers_from_input,
+                   starts_with_international_number, summarize_routes)
 import json
 from datetime import datetime, date
 
@@ -44,12 +46,20 @@ def send_sms():
                 'error': 'Message is required'
             }), 400
         
+        try:
+            priority = SMSPriority(str(data.get('priority', SMSPriority.NORMAL.value)).strip().lower())
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Priority must be one of: ' + ', '.join(p.value for p in SMSPriority)
+            }), 400
+        
         # Parse phone numbers from input or CSV content
         if isinstance(phone_numbers_input, str):
             # Check if it contains CSV-like content (commas, multiple lines)
             if ',' in phone_numbers_input or '\n' in phone_numbers_input:
                 # Check if it's CSV format or just multiple phone numbers
-                if phone_numbers_input.strip().startswith('+233') or any(line.strip().startswith('+233') for line in phone_numbers_input.split('\n')):
+                if any(starts_with_international_number(line) for line in phone_numbers_input.split('\n')):
                     # Multiple phone numbers input
                     phone_numbers = parse_phone_numbers_from_input(phone_numbers_input)
                 else:
@@ -85,12 +95,13 @@ def send_sms():
             }), 400
         
         # Send SMS messages
-        results = sms_service.send_bulk_sms(message, valid_numbers)
+        results = sms_service.send_bulk_sms(message, valid_numbers, priority)
         
         # Create response data for localStorage
         campaign_data = {
             'id': datetime.now().strftime('%Y%m%d_%H%M%S'),
             'message': message,
+            'priority': priority.value,
             'total_recipients': len(phone_numbers),
             'valid_numbers': len(valid_numbers),
             'invalid_numbers': len(invalid_numbers),
@@ -99,14 +110,15 @@ def send_sms():
             'total_cost': results.get('total_cost', 0.0),
             'created_at': datetime.now().isoformat(),
             'details': results['details'],
-            'invalid_numbers_list': invalid_numbers[:10]
+            'invalid_numbers_list': invalid_numbers[:10],
+            'routes': summarize_routes(valid_numbers, message)
         }
         
         response_data = {
             'success': True,
             'campaign': campaign_data,
             'message_length': len(message),
-            'results': results
+            'results': results.summary()
         }
         
         return jsonify(response_data)
@@ -133,6 +145,11 @@ def users():
     """User management page"""
     return render_template('users_modern.html')
 
+@app.route('/scheduler/metrics')
+def scheduler_metrics():
+    """Queue depth and p99 queue-wait per priority lane"""
+    return jsonify(sms_service.get_scheduler_metrics())
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
@@ -1,13 +1,23 @@
 import os
 import logging
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+import click
+from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 from sms_service import SMSService
-from utils import validate_phone_numbers, parse_csv_content, clean_phone_number
+from scheduler import SMSPriority
+from exports import EXPORT_BATCH_SIZE, EXPORT_FORMATS, serialize_rows, gzip_chunks
+from http_cache import LRUCache, make_etag, is_not_modified, conditional_response
+from db_routing import REPLICA_BIND, RoutingSession, ReadReplicaRouter, engine_options
+from sqlalchemy import event, inspect, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from utils import (validate_phone_numbers, parse_csv_content,
+                   normalize_phone_number, iter_csv_phone_numbers, summarize_routes)
+import io
 import json
-from datetime import datetime, date
+from datetime import datetime, date, time
 from enum import Enum
 
 
@@ -15,7 +25,7 @@ class Base(DeclarativeBase):
     pass
 
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -31,14 +41,25 @@ if not database_url:
     raise RuntimeError("DATABASE_URL environment variable is not set")
 
 app.config["SQLALCHEMY_DATABASE_URI"] = database_url
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options("DB")
+
+# Optional read replica for dashboard and statistics queries
+database_read_url = os.environ.get("DATABASE_READ_URL")
+if database_read_url:
+    app.config["SQLALCHEMY_BINDS"] = {
+        REPLICA_BIND: {"url": database_read_url, **engine_options("DB_READ")}
+    }
+
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 # Initialize the app with the extension
 db.init_app(app)
 
+replica_router = ReadReplicaRouter(
+    db,
+    max_lag_seconds=float(os.environ.get("DATABASE_READ_MAX_LAG", "10")),
+    check_interval=float(os.environ.get("DATABASE_READ_CHECK_INTERVAL", "5"))
+)
+
 # Initialize SMS service
 sms_service = SMSService()
 
@@ -52,6 +73,10 @@ class SMSStatus(Enum):
 class SMSCampaign(db.Model):
     """Model for storing SMS campaigns"""
     __tablename__ = 'sms_campaigns'
+    __table_args__ = (
+        # Serves the newest-first campaign list and its ETag without a table scan
+        db.Index('ix_sms_campaigns_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     message = db.Column(db.Text, nullable=False)
@@ -61,8 +86,11 @@ class SMSCampaign(db.Model):
     invalid_numbers = db.Column(db.Integer, nullable=False, default=0)
     total_cost = db.Column(db.Float, nullable=False, default=0.0)
     status = db.Column(db.Enum(SMSStatus), nullable=False, default=SMSStatus.PENDING)
+    priority = db.Column(db.Enum(SMSPriority), nullable=False, default=SMSPriority.NORMAL)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    contact_list_id = db.Column(db.Integer, db.ForeignKey('contact_lists.id'), nullable=True)
     
     # Relationship to SMS records
     sms_records = db.relationship('SMSRecord', backref='campaign', lazy=True, cascade='all, delete-orphan')
@@ -121,9 +149,194 @@ class SMSStatistics(db.Model):
         return f'<SMSStatistics {self.date}: {self.total_messages_sent} messages>'
 
 
+class ContactList(db.Model):
+    """Model for storing saved recipient lists"""
+    __tablename__ = 'contact_lists'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    description = db.Column(db.Text, nullable=True)
+    contact_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationship to contacts
+    contacts = db.relationship('Contact', backref='contact_list', lazy='dynamic', cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<ContactList {self.id}: {self.name} ({self.contact_count} contacts)>'
+
+
+class Contact(db.Model):
+    """Model for storing a normalized, validated phone number in a contact list"""
+    __tablename__ = 'contacts'
+    __table_args__ = (
+        db.UniqueConstraint('list_id', 'phone_number', name='uq_contacts_list_phone'),
+        db.Index('ix_contacts_list_id_id', 'list_id', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    list_id = db.Column(db.Integer, db.ForeignKey('contact_lists.id'), nullable=False)
+    phone_number = db.Column(db.String(20), nullable=False)  # Stored already cleaned and validated
+    name = db.Column(db.String(120), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Contact {self.id}: {self.phone_number}>'
+
+
+# Contacts read or inserted per database round trip
+CONTACT_BATCH_SIZE = 1000
+
+
+def iter_contact_numbers(list_id, batch_size=CONTACT_BATCH_SIZE):
+    """Stream the phone numbers of a contact list in id order.
+    
+    Uses keyset pagination rather than one open cursor, so the caller can
+    commit between batches while sending.
+    """
+    last_id = 0
+    while True:
+        rows = (db.session.query(Contact.id, Contact.phone_number)
+                .filter(Contact.list_id == list_id, Contact.id > last_id)
+                .order_by(Contact.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            return
+        for _, phone_number in rows:
+            yield phone_number
+        last_id = rows[-1].id
+
+
+def import_contacts(contact_list, raw_numbers, batch_size=CONTACT_BATCH_SIZE):
+    """Normalize, validate and insert numbers into a contact list batch by batch.
+    
+    Numbers already in the list are skipped, so re-importing a file only adds
+    what is new. Returns counts of added, duplicate and invalid numbers.
+    """
+    summary = {'added': 0, 'duplicates': 0, 'invalid': 0, 'invalid_numbers_list': []}
+    
+    insert = postgresql_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+    
+    def flush(batch):
+        # The unique constraint decides what is new, so concurrent imports
+        # into the same list skip each other's numbers instead of failing
+        statement = (insert(Contact)
+                     .values([{'list_id': contact_list.id, 'phone_number': number} for number in batch])
+                     .on_conflict_do_nothing(index_elements=['list_id', 'phone_number']))
+        added = db.session.execute(statement).rowcount
+        summary['added'] += added
+        summary['duplicates'] += len(batch) - added
+        if added:
+            # Incremented in SQL so concurrent imports do not lose updates
+            (db.session.query(ContactList)
+             .filter(ContactList.id == contact_list.id)
+             .update({ContactList.contact_count: ContactList.contact_count + added},
+                     synchronize_session=False))
+        db.session.commit()
+    
+    batch = {}
+    for raw_number in raw_numbers:
+        number = normalize_phone_number(raw_number)
+        if number is None:
+            summary['invalid'] += 1
+            if len(summary['invalid_numbers_list']) < 10:
+                summary['invalid_numbers_list'].append(raw_number)
+            continue
+        if number in batch:
+            summary['duplicates'] += 1
+            continue
+        batch[number] = None
+        if len(batch) >= batch_size:
+            flush(list(batch))
+            batch = {}
+    if batch:
+        flush(list(batch))
+    
+    return summary
+
+
+# Rendered campaign pages, keyed by campaign id and versioned by ETag
+page_cache = LRUCache(max_entries=int(os.environ.get("CAMPAIGN_PAGE_CACHE_SIZE", "128")))
+CAMPAIGNS_PAGE_KEY = 'campaigns'
+CAMPAIGNS_PAGE_SIZE = 50
+
+
+@event.listens_for(SMSCampaign, 'after_insert')
+@event.listens_for(SMSCampaign, 'after_update')
+@event.listens_for(SMSCampaign, 'after_delete')
+def invalidate_campaign_pages(mapper, connection, campaign):
+    """Drop cached pages as soon as a campaign is created, changes or completes"""
+    page_cache.invalidate(campaign.id)
+    page_cache.invalidate(CAMPAIGNS_PAGE_KEY)
+
+
+# Arbitrary key of the advisory lock that serializes schema upgrades across workers
+SCHEMA_UPGRADE_LOCK_ID = 7262001
+
+
+def upgrade_schema(engine):
+    """Add sms_campaigns columns and indexes introduced after the table was first created.
+    
+    db.create_all() only creates missing tables, so existing deployments get
+    the priority, updated_at and contact_list_id columns and the created_at
+    index here. Anything that already exists is left alone, so this is safe
+    to run at every startup.
+    """
+    campaigns_table = SMSCampaign.__table__
+    
+    with engine.begin() as connection:
+        postgres = connection.dialect.name == 'postgresql'
+        if postgres:
+            # Workers starting together must not race on the same ALTERs
+            connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {'id': SCHEMA_UPGRADE_LOCK_ID})
+        
+        columns = {column['name'] for column in inspect(connection).get_columns('sms_campaigns')}
+        
+        if 'priority' not in columns:
+            priority_type = campaigns_table.c.priority.type
+            if postgres:
+                priority_type.create(connection, checkfirst=True)
+            connection.execute(text(
+                f"ALTER TABLE sms_campaigns ADD COLUMN priority {priority_type.compile(dialect=connection.dialect)} "
+                f"NOT NULL DEFAULT '{SMSPriority.NORMAL.name}'"))
+            logging.info("Added sms_campaigns.priority")
+        
+        if 'updated_at' not in columns:
+            timestamp_type = campaigns_table.c.updated_at.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE sms_campaigns ADD COLUMN updated_at {timestamp_type}"))
+            # Existing campaigns last changed when they completed
+            connection.execute(text("UPDATE sms_campaigns SET updated_at = COALESCE(completed_at, created_at)"))
+            if postgres:
+                connection.execute(text("ALTER TABLE sms_campaigns ALTER COLUMN updated_at SET NOT NULL"))
+            logging.info("Added sms_campaigns.updated_at")
+        
+        if 'contact_list_id' not in columns:
+            connection.execute(text(
+                "ALTER TABLE sms_campaigns ADD COLUMN contact_list_id INTEGER REFERENCES contact_lists (id)"))
+            logging.info("Added sms_campaigns.contact_list_id")
+        
+        indexes = {index['name'] for index in inspect(connection).get_indexes('sms_campaigns')}
+        for index in campaigns_table.indexes:
+            if index.name not in indexes:
+                index.create(connection)
+                logging.info(f"Added index {index.name}")
+
+
 # Create database tables
 with app.app_context():
     db.create_all()
+    upgrade_schema(db.engine)
+    
+    if database_read_url:
+        # A real standby already has the schema; a second local database used
+        # for testing gets the tables created here
+        try:
+            db.metadata.create_all(db.engines[REPLICA_BIND])
+            upgrade_schema(db.engines[REPLICA_BIND])
+        except Exception as e:
+            logging.warning(f"Could not verify read replica schema: {str(e)}")
 
 @app.route('/')
 def index():
@@ -139,6 +352,14 @@ def send_sms():
         phone_numbers_text = request.form.get('phone_numbers', '').strip()
         csv_file = request.files.get('csv_file')
         
+        try:
+            priority = SMSPriority(request.form.get('priority', SMSPriority.NORMAL.value).strip().lower())
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Priority must be one of: ' + ', '.join(p.value for p in SMSPriority)
+            }), 400
+        
         # Validate message
         if not message:
             return jsonify({
@@ -152,6 +373,16 @@ def send_sms():
                 'error': 'Message is too long. Maximum 1600 characters allowed.'
             }), 400
         
+        # Saved contact lists are stored pre-validated; stream them straight from the DB
+        list_id = request.form.get('list_id', '').strip()
+        if list_id:
+            if not list_id.isdigit():
+                return jsonify({
+                    'success': False,
+                    'error': 'list_id must be an integer'
+                }), 400
+            return send_to_contact_list(message, int(list_id), priority)
+        
         # Collect phone numbers
         phone_numbers = []
         
@@ -187,15 +418,7 @@ def send_sms():
             }), 400
         
         # Clean and validate phone numbers
-        valid_numbers = []
-        invalid_numbers = []
-        
-        for number in phone_numbers:
-            cleaned_number = clean_phone_number(number)
-            if validate_phone_numbers([cleaned_number]):
-                valid_numbers.append(cleaned_number)
-            else:
-                invalid_numbers.append(number)
+        valid_numbers, invalid_numbers = validate_phone_numbers(phone_numbers)
         
         if not valid_numbers:
             return jsonify({
@@ -209,6 +432,7 @@ def send_sms():
         campaign.message = message
         campaign.total_recipients = len(phone_numbers)
         campaign.invalid_numbers = len(invalid_numbers)
+        campaign.priority = priority
         db.session.add(campaign)
         db.session.flush()  # Get the campaign ID
         
@@ -221,7 +445,8 @@ def send_sms():
             db.session.add(invalid_record)
         
         # Send SMS messages
-        results = sms_service.send_bulk_sms_with_database(message, valid_numbers, campaign.id)
+        results = sms_service.send_bulk_sms_with_database(
+            message, valid_numbers, campaign.id, db, SMSRecord, SMSStatus, priority)
         
         # Update campaign with results
         campaign.successful_sends = results['successful']
@@ -264,7 +489,9 @@ def send_sms():
             'invalid_numbers_list': invalid_numbers[:10],  # Show first 10 invalid numbers
             'message_length': len(message),
             'total_cost': results.get('total_cost', 0.0),
-            'results': results
+            'priority': priority.value,
+            'routes': summarize_routes(valid_numbers, message),
+            'results': results.summary()
         }
         
         return jsonify(response_data)
@@ -277,25 +504,373 @@ def send_sms():
             'error': f'An unexpected error occurred: {str(e)}'
         }), 500
 
+def send_to_contact_list(message, list_id, priority):
+    """Send a campaign to every contact in a saved list"""
+    contact_list = db.session.get(ContactList, list_id)
+    if contact_list is None:
+        return jsonify({
+            'success': False,
+            'error': f'Contact list {list_id} not found'
+        }), 404
+    
+    if contact_list.contact_count == 0:
+        return jsonify({
+            'success': False,
+            'error': 'Contact list is empty'
+        }), 400
+    
+    campaign = SMSCampaign()
+    campaign.message = message
+    campaign.total_recipients = contact_list.contact_count
+    campaign.invalid_numbers = 0
+    campaign.priority = priority
+    campaign.contact_list_id = contact_list.id
+    db.session.add(campaign)
+    db.session.flush()  # Get the campaign ID
+    
+    results = sms_service.send_bulk_sms_with_database(
+        message, iter_contact_numbers(contact_list.id), campaign.id, db, SMSRecord, SMSStatus, priority)
+    messages_sent = results['successful'] + results['failed']
+    
+    # Update campaign with results
+    campaign.successful_sends = results['successful']
+    campaign.failed_sends = results['failed']
+    campaign.total_cost = results.get('total_cost', 0.0)
+    campaign.status = SMSStatus.SUCCESS if results['failed'] == 0 else SMSStatus.FAILED
+    campaign.completed_at = datetime.utcnow()
+    
+    # Update daily statistics
+    today = date.today()
+    stats = SMSStatistics.query.filter_by(date=today).first()
+    if not stats:
+        stats = SMSStatistics()
+        stats.date = today
+        stats.total_campaigns = 1
+        stats.total_messages_sent = messages_sent
+        stats.total_successful = results['successful']
+        stats.total_failed = results['failed']
+        stats.total_cost = results.get('total_cost', 0.0)
+        db.session.add(stats)
+    else:
+        stats.total_campaigns += 1
+        stats.total_messages_sent += messages_sent
+        stats.total_successful += results['successful']
+        stats.total_failed += results['failed']
+        stats.total_cost += results.get('total_cost', 0.0)
+        stats.updated_at = datetime.utcnow()
+    
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        'campaign_id': campaign.id,
+        'list_id': contact_list.id,
+        'total_numbers': messages_sent,
+        'valid_numbers': messages_sent,
+        'invalid_numbers': 0,
+        'successful_sends': results['successful'],
+        'failed_sends': results['failed'],
+        'invalid_numbers_list': [],
+        'message_length': len(message),
+        'total_cost': results.get('total_cost', 0.0),
+        'priority': priority.value,
+        'results': results.summary()
+    })
+
+@app.route('/contact_lists', methods=['GET'])
+@replica_router.read_only
+def contact_lists():
+    """List saved contact lists"""
+    lists = ContactList.query.order_by(ContactList.created_at.desc()).all()
+    return jsonify({
+        'success': True,
+        'contact_lists': [{
+            'id': contact_list.id,
+            'name': contact_list.name,
+            'description': contact_list.description,
+            'contact_count': contact_list.contact_count,
+            'created_at': contact_list.created_at.isoformat()
+        } for contact_list in lists]
+    })
+
+@app.route('/contact_lists', methods=['POST'])
+def create_contact_list():
+    """Create an empty contact list"""
+    data = request.get_json(silent=True) or request.form
+    name = (data.get('name') or '').strip()
+    if not name:
+        return jsonify({
+            'success': False,
+            'error': 'List name is required'
+        }), 400
+    
+    contact_list = ContactList()
+    contact_list.name = name
+    contact_list.description = (data.get('description') or '').strip() or None
+    db.session.add(contact_list)
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        'list_id': contact_list.id,
+        'name': contact_list.name
+    }), 201
+
+@app.route('/contact_lists/<int:list_id>/import', methods=['POST'])
+def import_contact_list(list_id):
+    """Add phone numbers from a textarea and/or CSV upload to a contact list"""
+    contact_list = db.session.get(ContactList, list_id)
+    if contact_list is None:
+        return jsonify({
+            'success': False,
+            'error': f'Contact list {list_id} not found'
+        }), 404
+    
+    try:
+        summary = {'added': 0, 'duplicates': 0, 'invalid': 0, 'invalid_numbers_list': []}
+        
+        def merge(part):
+            for key in ('added', 'duplicates', 'invalid'):
+                summary[key] += part[key]
+            summary['invalid_numbers_list'] = (summary['invalid_numbers_list'] + part['invalid_numbers_list'])[:10]
+        
+        phone_numbers_text = request.form.get('phone_numbers', '').strip()
+        if phone_numbers_text:
+            merge(import_contacts(contact_list, (line.strip() for line in phone_numbers_text.split('\n') if line.strip())))
+        
+        # Read the upload row by row instead of decoding the whole file
+        csv_file = request.files.get('csv_file')
+        if csv_file and csv_file.filename:
+            merge(import_contacts(contact_list, iter_csv_phone_numbers(io.TextIOWrapper(csv_file.stream, encoding='utf-8'))))
+        
+        return jsonify({
+            'success': True,
+            'list_id': contact_list.id,
+            'contact_count': contact_list.contact_count,
+            **summary
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error importing contacts into list {list_id}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Error importing contacts: {str(e)}'
+        }), 400
+
 @app.route('/campaigns')
+@replica_router.read_only
 def campaigns():
     """View all SMS campaigns"""
-    campaigns = SMSCampaign.query.order_by(SMSCampaign.created_at.desc()).limit(50).all()
-    return render_template('campaigns.html', campaigns=campaigns)
+    # The page shows only the newest campaigns, so their ids and update times
+    # identify its version. Reading them walks CAMPAIGNS_PAGE_SIZE entries of
+    # the created_at index; unchanged lists are answered with 304 or from the
+    # page cache without loading full rows
+    newest_first = (SMSCampaign.created_at.desc(), SMSCampaign.id.desc())
+    page_versions = (db.session.query(SMSCampaign.id, SMSCampaign.updated_at)
+                     .order_by(*newest_first).limit(CAMPAIGNS_PAGE_SIZE).all())
+    etag = make_etag('campaigns', *(f'{row.id}@{row.updated_at}' for row in page_versions))
+    last_modified = max((row.updated_at for row in page_versions), default=None)
+    
+    # Deleting a listed campaign does not move the newest updated_at, so only
+    # the ETag can validate the list
+    if is_not_modified(etag):
+        return conditional_response(None, etag, last_modified)
+    
+    body = page_cache.get(CAMPAIGNS_PAGE_KEY, etag)
+    if body is None:
+        campaigns = SMSCampaign.query.order_by(*newest_first).limit(CAMPAIGNS_PAGE_SIZE).all()
+        body = render_template('campaigns.html', campaigns=campaigns)
+        page_cache.set(CAMPAIGNS_PAGE_KEY, etag, body)
+    
+    return conditional_response(body, etag, last_modified)
 
 @app.route('/campaign/<int:campaign_id>')
+@replica_router.read_only
 def campaign_details(campaign_id):
     """View details of a specific campaign"""
-    campaign = SMSCampaign.query.get_or_404(campaign_id)
-    sms_records = SMSRecord.query.filter_by(campaign_id=campaign_id).all()
-    invalid_numbers = InvalidPhoneNumber.query.filter_by(campaign_id=campaign_id).all()
+    campaign = replica_router.get_or_404(SMSCampaign, campaign_id)
     
-    return render_template('campaign_details.html', 
-                         campaign=campaign, 
-                         sms_records=sms_records,
-                         invalid_numbers=invalid_numbers)
+    # Campaigns still sending change on every request, so only completed ones are cached
+    if campaign.completed_at is None:
+        sms_records = SMSRecord.query.filter_by(campaign_id=campaign_id).all()
+        invalid_numbers = InvalidPhoneNumber.query.filter_by(campaign_id=campaign_id).all()
+        return render_template('campaign_details.html', 
+                             campaign=campaign, 
+                             sms_records=sms_records,
+                             invalid_numbers=invalid_numbers)
+    
+    last_modified = campaign.updated_at or campaign.completed_at
+    etag = make_etag('campaign', campaign.id, campaign.completed_at, campaign.updated_at)
+    
+    if is_not_modified(etag, last_modified):
+        return conditional_response(None, etag, last_modified)
+    
+    body = page_cache.get(campaign.id, etag)
+    if body is None:
+        sms_records = SMSRecord.query.filter_by(campaign_id=campaign_id).all()
+        invalid_numbers = InvalidPhoneNumber.query.filter_by(campaign_id=campaign_id).all()
+        body = render_template('campaign_details.html', 
+                             campaign=campaign, 
+                             sms_records=sms_records,
+                             invalid_numbers=invalid_numbers)
+        page_cache.set(campaign.id, etag, body)
+    
+    return conditional_response(body, etag, last_modified)
+
+# Pseudo-status used to select the campaign's rejected numbers in exports
+INVALID_EXPORT_STATUS = 'invalid'
+
+
+def parse_export_filters(status=None, since=None, until=None):
+    """Validate export filter values, raising ValueError for bad input"""
+    if status:
+        status = status.strip().lower()
+        allowed = [s.value for s in SMSStatus] + [INVALID_EXPORT_STATUS]
+        if status not in allowed:
+            raise ValueError(f"Status must be one of: {', '.join(allowed)}")
+    
+    def parse_datetime(value, name, end_of_day=False):
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            # A bare date covers the whole day, so 'until' runs to its last instant
+            day = date.fromisoformat(value)
+            return datetime.combine(day, time.max if end_of_day else time.min)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an ISO date or datetime")
+    
+    return {
+        'status': status or None,
+        'since': parse_datetime(since, 'since'),
+        'until': parse_datetime(until, 'until', end_of_day=True)
+    }
+
+
+def iter_campaign_export_rows(campaign_id, status=None, since=None, until=None):
+    """Stream a campaign's SMS records and invalid numbers as export rows.
+    
+    Rows are read with server-side cursors in batches of EXPORT_BATCH_SIZE, so
+    memory use does not grow with campaign size.
+    """
+    if status != INVALID_EXPORT_STATUS:
+        query = (db.session.query(SMSRecord.id, SMSRecord.phone_number, SMSRecord.status,
+                                  SMSRecord.message_id, SMSRecord.cost, SMSRecord.error_message,
+                                  SMSRecord.sent_at, SMSRecord.created_at)
+                 .filter(SMSRecord.campaign_id == campaign_id))
+        if status:
+            query = query.filter(SMSRecord.status == SMSStatus(status))
+        if since:
+            query = query.filter(SMSRecord.created_at >= since)
+        if until:
+            query = query.filter(SMSRecord.created_at <= until)
+        
+        for row in query.order_by(SMSRecord.id).yield_per(EXPORT_BATCH_SIZE):
+            yield {
+                'record_type': 'sms',
+                'id': row.id,
+                'campaign_id': campaign_id,
+                'phone_number': row.phone_number,
+                'status': row.status.value,
+                'message_id': row.message_id,
+                'cost': row.cost,
+                'error_message': row.error_message,
+                'sent_at': row.sent_at.isoformat() if row.sent_at else None,
+                'created_at': row.created_at.isoformat()
+            }
+    
+    if status in (None, INVALID_EXPORT_STATUS):
+        query = (db.session.query(InvalidPhoneNumber.id, InvalidPhoneNumber.phone_number,
+                                  InvalidPhoneNumber.reason, InvalidPhoneNumber.created_at)
+                 .filter(InvalidPhoneNumber.campaign_id == campaign_id))
+        if since:
+            query = query.filter(InvalidPhoneNumber.created_at >= since)
+        if until:
+            query = query.filter(InvalidPhoneNumber.created_at <= until)
+        
+        for row in query.order_by(InvalidPhoneNumber.id).yield_per(EXPORT_BATCH_SIZE):
+            yield {
+                'record_type': 'invalid',
+                'id': row.id,
+                'campaign_id': campaign_id,
+                'phone_number': row.phone_number,
+                'status': INVALID_EXPORT_STATUS,
+                'message_id': None,
+                'cost': None,
+                'error_message': row.reason,
+                'sent_at': None,
+                'created_at': row.created_at.isoformat()
+            }
+
+# Not read_only: a long export query on a hot standby can be cancelled by a
+# replication conflict partway through the download, so exports use the primary
+@app.route('/campaign/<int:campaign_id>/export.<export_format>')
+def export_campaign(campaign_id, export_format):
+    """Stream a campaign's records as CSV or NDJSON, optionally gzipped"""
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'error': f"Export format must be one of: {', '.join(EXPORT_FORMATS)}"
+        }), 404
+    
+    campaign = db.get_or_404(SMSCampaign, campaign_id)
+    
+    try:
+        filters = parse_export_filters(request.args.get('status'),
+                                       request.args.get('since'),
+                                       request.args.get('until'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    chunks = serialize_rows(iter_campaign_export_rows(campaign.id, **filters), export_format)
+    filename = f'campaign_{campaign.id}.{export_format}'
+    mimetype = EXPORT_FORMATS[export_format]
+    
+    if request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+        chunks = gzip_chunks(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"'
+    })
+
+@app.cli.command('export-campaign')
+@click.argument('campaign_id', type=int)
+@click.option('--format', 'export_format', type=click.Choice(list(EXPORT_FORMATS)), default='csv',
+              help='Output format.')
+@click.option('--status', default=None, help='Only export records with this status (or "invalid").')
+@click.option('--since', default=None, help='Only export records created at or after this ISO date/time.')
+@click.option('--until', default=None, help='Only export records created at or before this ISO date/time; a date includes the whole day.')
+@click.option('--gzip', 'use_gzip', is_flag=True, help='Gzip the output.')
+@click.option('--output', '-o', default='-', help='Output file (default: stdout).')
+def export_campaign_command(campaign_id, export_format, status, since, until, use_gzip, output):
+    """Export a campaign's SMS records and invalid numbers."""
+    if db.session.get(SMSCampaign, campaign_id) is None:
+        raise click.ClickException(f'Campaign {campaign_id} not found')
+    
+    try:
+        filters = parse_export_filters(status, since, until)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    
+    chunks = serialize_rows(iter_campaign_export_rows(campaign_id, **filters), export_format)
+    chunks = gzip_chunks(chunks) if use_gzip else (chunk.encode('utf-8') for chunk in chunks)
+    
+    with click.open_file(output, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
 
 @app.route('/statistics')
+@replica_router.read_only
 def statistics():
     """View SMS statistics"""
     from sqlalchemy import func
@@ -322,6 +897,11 @@ def statistics():
                          daily_stats=daily_stats,
                          overall_stats=overall_stats)
 
+@app.route('/scheduler/metrics')
+def scheduler_metrics():
+    """Queue depth and p99 queue-wait per priority lane"""
+    return jsonify(sms_service.get_scheduler_metrics())
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
@@ -330,7 +910,9 @@ def health_check():
         'service': 'SMS Broadcasting App', 
         'database': 'connected',
         'sms_environment': 'sandbox' if sms_service.username == 'sandbox' else 'production',
-        'api_configured': bool(sms_service.api_key and sms_service.api_key != 'your-api-key-here')
+        'api_configured': bool(sms_service.api_key and sms_service.api_key != 'your-api-key-here'),
+        'page_cache': page_cache.stats(),
+        'read_replica': replica_router.status()
     })
 
 if __name__ == '__main__':
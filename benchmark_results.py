@@ -0,0 +1,68 @@
+"""Compare memory used by per-recipient send results.
+
+Builds the same bulk-send outcome as the old list of result dicts and as a
+BulkSendResults container, and reports the traced allocation of each.
+
+    python benchmark_results.py [recipients] [failure_rate]
+"""
+import sys
+import tracemalloc
+
+from results import BulkSendResults
+
+ERRORS = ['SMS failed with status: InsufficientBalance', 'SMS failed with status: InvalidPhoneNumber']
+
+
+def fake_results(count: int, failure_rate: float):
+    """Yield send_single_sms-shaped result dicts"""
+    failure_every = int(1 / failure_rate) if failure_rate > 0 else 0
+    for i in range(count):
+        phone_number = f'+23324{i:07d}'
+        if failure_every and i % failure_every == 0:
+            # Provider errors are built per response, so equal strings are distinct objects
+            yield {'success': False, 'error': ''.join(ERRORS[i % 2]), 'phone_number': phone_number}
+        else:
+            yield {'success': True, 'phone_number': phone_number,
+                   'message_id': f'ATXid_{i:032x}', 'cost': 'KES 0.8000'}
+
+
+def measure(build, count: int, failure_rate: float) -> int:
+    tracemalloc.start()
+    container = build(fake_results(count, failure_rate))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return size
+
+
+def build_dicts(results):
+    # Same shape send_bulk_sms used to return
+    summary = {'successful': 0, 'failed': 0, 'details': [], 'total_cost': 0.0}
+    for result in results:
+        summary['details'].append(result)
+        summary['successful' if result['success'] else 'failed'] += 1
+    return summary
+
+
+def build_compact(results):
+    compact = BulkSendResults()
+    for result in results:
+        compact.add_result(result)
+    return compact
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    failure_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    dict_size = measure(build_dicts, count, failure_rate)
+    compact_size = measure(build_compact, count, failure_rate)
+
+    print(f'{count} recipients, {failure_rate:.0%} failures')
+    print(f'  list of dicts:    {dict_size / 1_048_576:8.1f} MiB ({dict_size / count:6.0f} B/recipient)')
+    print(f'  BulkSendResults:  {compact_size / 1_048_576:8.1f} MiB ({compact_size / count:6.0f} B/recipient)')
+    print(f'  reduction:        {1 - compact_size / dict_size:8.1%}')
+
+
+if __name__ == '__main__':
+    main()
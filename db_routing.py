@@ -0,0 +1,150 @@
+import os
+import time
+import logging
+import functools
+import threading
+from typing import Any, Dict, Optional
+
+from flask import abort, current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+
+# Flask-SQLAlchemy bind key of the read replica engine
+REPLICA_BIND = 'replica'
+
+# Replay delay of a Postgres standby; 0 on a primary or a standby that is fully caught up
+POSTGRES_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def engine_options(prefix: str) -> Dict[str, Any]:
+    """Engine and pool options for one database role, read from <prefix>_* env vars.
+
+    e.g. engine_options('DB_READ') reads DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW,
+    DB_READ_POOL_TIMEOUT and DB_READ_POOL_RECYCLE.
+    """
+    options = {
+        "pool_recycle": int(os.environ.get(f"{prefix}_POOL_RECYCLE", "300")),
+        "pool_pre_ping": True,
+    }
+    for name in ("pool_size", "max_overflow", "pool_timeout"):
+        value = os.environ.get(f"{prefix}_{name.upper()}")
+        if value is not None:
+            options[name] = int(value)
+    return options
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica during read-only requests.
+
+    Flushes always go to the primary, so a read-only view that writes by
+    mistake still writes to the right database.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_app_context()
+                and g.get('db_use_replica')):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadReplicaRouter:
+    """Decides per request whether reads may use the replica.
+
+    The replica is used only when DATABASE_READ_URL is configured and its last
+    health check found it reachable and within max_lag_seconds of the
+    primary; otherwise reads fall back to the primary. Health is re-checked
+    at most every check_interval seconds.
+    """
+
+    def __init__(self, db, max_lag_seconds: float = 10.0, check_interval: float = 5.0):
+        self.db = db
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._healthy = False
+        self._lag = None
+        self._error = None
+
+    @property
+    def configured(self) -> bool:
+        return REPLICA_BIND in current_app.config.get("SQLALCHEMY_BINDS", {})
+
+    def replica_usable(self) -> bool:
+        if not self.configured:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            stale = self._checked_at is None or now - self._checked_at >= self.check_interval
+            if stale:
+                # Claim the check so concurrent requests keep using the last result
+                self._checked_at = now
+        if stale:
+            self._check()
+        return self._healthy
+
+    def _check(self):
+        engine = self.db.engines[REPLICA_BIND]
+        try:
+            with engine.connect() as connection:
+                if engine.dialect.name == 'postgresql':
+                    lag = float(connection.execute(POSTGRES_LAG_SQL).scalar() or 0.0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as e:
+            if self._healthy or self._error is None:
+                logging.warning(f"Read replica unavailable, using primary: {str(e)}")
+            self._healthy, self._lag, self._error = False, None, str(e)
+            return
+
+        healthy = lag <= self.max_lag_seconds
+        if not healthy and self._healthy:
+            logging.warning(f"Read replica is {lag:.1f}s behind, using primary")
+        self._healthy, self._lag, self._error = healthy, lag, None
+
+    def read_only(self, view):
+        """Route the view's queries to the replica when it is healthy"""
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            g.db_use_replica = self.replica_usable()
+            return view(*args, **kwargs)
+        return wrapper
+
+    def on_replica(self) -> bool:
+        return bool(g.get('db_use_replica'))
+
+    def use_primary(self):
+        """Send the rest of this request's queries to the primary"""
+        g.db_use_replica = False
+
+    def get_or_404(self, model, ident):
+        """Load a row by primary key, retrying on the primary before giving up.
+
+        Rows written moments ago may not have reached the replica yet.
+        """
+        instance = self.db.session.get(model, ident)
+        if instance is None and self.on_replica():
+            self.use_primary()
+            instance = self.db.session.get(model, ident)
+        if instance is None:
+            abort(404)
+        return instance
+
+    def status(self) -> Dict[str, Optional[Any]]:
+        if not self.configured:
+            return {'configured': False}
+        return {
+            'configured': True,
+            'healthy': self._healthy,
+            'lag_seconds': self._lag,
+            'max_lag_seconds': self.max_lag_seconds,
+            'error': self._error
+        }
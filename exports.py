@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator
+
+# Column order shared by the CSV header and NDJSON records
+EXPORT_COLUMNS = [
+    'record_type',
+    'id',
+    'campaign_id',
+    'phone_number',
+    'status',
+    'message_id',
+    'cost',
+    'error_message',
+    'sent_at',
+    'created_at',
+]
+
+# Rows fetched per database round trip and serialized per yielded chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize export rows as CSV, yielding one chunk per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize export rows as newline-delimited JSON, one chunk per batch of rows"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, default=str))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def serialize_rows(rows: Iterable[Dict[str, Any]], export_format: str) -> Iterator[str]:
+    """Serialize export rows in the requested format ('csv' or 'ndjson')"""
+    if export_format == 'csv':
+        return iter_csv(rows)
+    if export_format == 'ndjson':
+        return iter_ndjson(rows)
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
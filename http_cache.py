@@ -0,0 +1,88 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Hashable, Optional
+
+from flask import Response, request
+
+
+class LRUCache:
+    """Small thread-safe LRU cache of versioned values.
+
+    Each entry stores the version (ETag) it was built for, so a lookup with a
+    newer version misses even if the entry was never explicitly invalidated.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, version: str, value: Any):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag value from the parts that identify a page version"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Database timestamps are naive UTC; HTTP dates have one-second precision
+    return value.replace(microsecond=0, tzinfo=value.tzinfo or timezone.utc)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Check the current request's conditional headers against a page version"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return _as_utc(last_modified) <= request.if_modified_since
+    return False
+
+
+def conditional_response(body: Optional[str], etag: str,
+                         last_modified: Optional[datetime] = None) -> Response:
+    """Build a 200 response for body, or a bodiless 304 when body is None"""
+    response = Response(body, status=200 if body is not None else 304, mimetype='text/html')
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+    # Browsers and dashboards may keep the page but must revalidate each time
+    response.cache_control.no_cache = True
+    return response
+
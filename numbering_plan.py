@@ -0,0 +1,186 @@
+import os
+import re
+import json
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+DEFAULT_PLAN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'numbering_plans.json')
+
+_NON_DIGIT_OR_PLUS = re.compile(r'[^\d+]')
+
+
+class PrefixEntry(NamedTuple):
+    """What a numbering-plan prefix tells us about the numbers under it"""
+    country: str
+    country_code: str
+    length: int  # Total digits including the country code
+    carrier: Optional[str]
+    route: str
+
+
+class NumberInfo(NamedTuple):
+    """A valid phone number with its country, carrier and send route"""
+    e164: str
+    country: str
+    carrier: Optional[str]
+    route: str
+
+
+class _TrieNode:
+    __slots__ = ('children', 'entry')
+
+    def __init__(self):
+        self.children = {}
+        self.entry = None
+
+
+class NumberingPlan:
+    """Country and operator prefix tables indexed in a digit trie.
+
+    Validating and classifying a number is a single walk down the trie over its
+    E.164 digits, keeping the deepest (most specific) prefix that matched.
+    """
+
+    def __init__(self, countries: Dict[str, dict], default_country: str):
+        if default_country not in countries:
+            raise ValueError(f"Default country {default_country} is not in the numbering plan")
+
+        self.countries = countries
+        self.default_country = default_country
+        self.route_rates = {}
+        self.route_costs = {}
+        self._root = _TrieNode()
+
+        for iso, country in countries.items():
+            country_code = country['country_code']
+            length = len(country_code) + country['national_number_length']
+
+            for prefix in country.get('valid_prefixes', ['']):
+                self._insert(country_code + prefix, PrefixEntry(iso, country_code, length, None, iso))
+
+            for carrier, operator in country.get('operators', {}).items():
+                route = f'{iso}-{carrier}'
+                for prefix in operator['prefixes']:
+                    self._insert(country_code + prefix, PrefixEntry(iso, country_code, length, carrier, route))
+                if 'rate_per_second' in operator:
+                    self.route_rates[route] = float(operator['rate_per_second'])
+                if 'cost_per_part' in operator:
+                    self.route_costs[route] = float(operator['cost_per_part'])
+
+            if 'cost_per_part' in country:
+                self.route_costs[iso] = float(country['cost_per_part'])
+
+        # Full lengths (country code included) of numbers that may arrive without a leading +
+        self._international_lengths = {}
+        for country in countries.values():
+            self._international_lengths.setdefault(country['country_code'], set()).add(
+                len(country['country_code']) + country['national_number_length'])
+        self._country_codes = sorted(self._international_lengths, key=len, reverse=True)
+
+    def _insert(self, digits: str, entry: PrefixEntry):
+        node = self._root
+        for digit in digits:
+            child = node.children.get(digit)
+            if child is None:
+                child = node.children[digit] = _TrieNode()
+            node = child
+        node.entry = entry
+
+    def lookup(self, digits: str) -> Optional[PrefixEntry]:
+        """Match E.164 digits (no leading +) against the plan, or None if invalid"""
+        if not (digits.isascii() and digits.isdigit()):
+            return None
+
+        node = self._root
+        entry = None
+        for digit in digits:
+            node = node.children.get(digit)
+            if node is None:
+                break
+            if node.entry is not None:
+                entry = node.entry
+
+        if entry is None or len(digits) != entry.length:
+            return None
+        return entry
+
+    def normalize(self, phone_number: str, default_country: Optional[str] = None) -> str:
+        """Clean a phone number into +<country code><number> form where it can be recognized"""
+        if not phone_number:
+            return ""
+
+        # Remove all non-digit characters except +
+        cleaned = _NON_DIGIT_OR_PLUS.sub('', phone_number.strip())
+        country = self.countries[default_country or self.default_country]
+
+        if cleaned.startswith('+'):
+            return cleaned
+        if cleaned.startswith('00'):
+            # International call prefix
+            return '+' + cleaned[2:]
+
+        national_prefix = country.get('national_prefix')
+        if national_prefix and cleaned.startswith(national_prefix):
+            # Replace the trunk prefix with the country code
+            return '+' + country['country_code'] + cleaned[len(national_prefix):]
+
+        for country_code in self._country_codes:
+            # Only a full-length number starts with its country code; a shorter
+            # one is a national number that happens to begin with those digits
+            if cleaned.startswith(country_code) and len(cleaned) in self._international_lengths[country_code]:
+                # Add + if missing
+                return '+' + cleaned
+
+        if len(cleaned) == country['national_number_length']:
+            # Assume a national number of the default country
+            return '+' + country['country_code'] + cleaned
+
+        return cleaned
+
+    def classify(self, phone_number: str, default_country: Optional[str] = None) -> Optional[NumberInfo]:
+        """Normalize and validate a raw number, tagging it with country, carrier and route"""
+        cleaned = self.normalize(phone_number, default_country)
+        if not cleaned.startswith('+'):
+            return None
+
+        entry = self.lookup(cleaned[1:])
+        if entry is None:
+            return None
+        return NumberInfo(cleaned, entry.country, entry.carrier, entry.route)
+
+    def route_of(self, e164: str) -> Optional[str]:
+        """Send route of an already-normalized number"""
+        entry = self.lookup(e164.lstrip('+'))
+        return entry.route if entry else None
+
+    def estimate_cost(self, route: str, sms_parts: int) -> Optional[float]:
+        """Estimated cost of sending sms_parts message parts on a route, if priced"""
+        # Carrier routes fall back to their country's price
+        cost_per_part = self.route_costs.get(route, self.route_costs.get(route.split('-', 1)[0]))
+        return cost_per_part * sms_parts if cost_per_part is not None else None
+
+    def group_by_route(self, phone_numbers: Iterable[str]) -> Dict[str, List[str]]:
+        """Group already-normalized numbers by send route; unknown numbers are left out"""
+        groups = {}
+        for phone_number in phone_numbers:
+            route = self.route_of(phone_number)
+            if route is not None:
+                groups.setdefault(route, []).append(phone_number)
+        return groups
+
+
+def load_numbering_plan(path: Optional[str] = None, default_country: Optional[str] = None) -> NumberingPlan:
+    """Build a numbering plan from a JSON prefix table"""
+    with open(path or DEFAULT_PLAN_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+    return NumberingPlan(data['countries'], default_country or data.get('default_country', 'GH'))
+
+
+_plan = None
+
+
+def get_numbering_plan() -> NumberingPlan:
+    """The process-wide numbering plan, loaded on first use"""
+    global _plan
+    if _plan is None:
+        _plan = load_numbering_plan(os.getenv('NUMBERING_PLAN_FILE'), os.getenv('DEFAULT_COUNTRY'))
+    return _plan
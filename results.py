@@ -0,0 +1,141 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+# Per-recipient status codes stored in BulkSendResults.status_codes
+STATUS_FAILED = 0
+STATUS_SUCCESS = 1
+
+# Marks a recipient with no error in BulkSendResults.error_ids
+NO_ERROR = -1
+
+
+def parse_cost(cost: Any) -> Optional[float]:
+    """Convert a provider cost string such as 'KES 0.8000' to a float, or None if unparseable"""
+    if isinstance(cost, (int, float)):
+        return float(cost)
+    try:
+        # Remove currency prefix and convert to float
+        return float(cost.replace('KES', '').replace('USD', '').strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+class BulkSendResults:
+    """Per-recipient results of a bulk send, stored column-wise.
+
+    Instead of one dict per recipient, each field is a column: status codes as
+    bytes, costs as doubles and errors as indexes into a table holding each
+    distinct error string once. The successful/failed/total_cost counters are
+    kept up to date as results are added, and dict or JSON views are only
+    built when a caller asks for them.
+
+    With keep_details=False only the counters are kept, for callers that
+    store per-recipient outcomes elsewhere (e.g. in sms_records).
+    """
+
+    __slots__ = ('phone_numbers', 'status_codes', 'costs', 'message_ids', 'error_ids',
+                 'errors', '_error_index', 'successful', 'failed', 'total_cost', 'keep_details')
+
+    def __init__(self, keep_details: bool = True):
+        self.keep_details = keep_details
+        self.phone_numbers = []
+        self.status_codes = array('B')
+        self.costs = array('d')
+        self.message_ids = []
+        self.error_ids = array('i')
+        self.errors = []
+        self._error_index = {}
+        self.successful = 0
+        self.failed = 0
+        self.total_cost = 0.0
+
+    def add(self, phone_number: str, success: bool, message_id: Optional[str] = None,
+            cost: float = 0.0, error: Optional[str] = None):
+        """Record the outcome for one recipient"""
+        if success:
+            self.successful += 1
+            self.total_cost += cost
+        else:
+            self.failed += 1
+
+        if not self.keep_details:
+            return
+
+        self.phone_numbers.append(phone_number)
+        self.message_ids.append(message_id)
+        self.costs.append(cost)
+        self.status_codes.append(STATUS_SUCCESS if success else STATUS_FAILED)
+
+        if error is None:
+            self.error_ids.append(NO_ERROR)
+        else:
+            error_id = self._error_index.get(error)
+            if error_id is None:
+                error_id = self._error_index[error] = len(self.errors)
+                self.errors.append(error)
+            self.error_ids.append(error_id)
+
+    def add_result(self, result: Dict[str, Any]) -> Optional[float]:
+        """Record a send_single_sms result dict; returns its parsed cost if it succeeded"""
+        if result['success']:
+            cost = parse_cost(result.get('cost', '0'))
+            self.add(result['phone_number'], True, result.get('message_id'), cost or 0.0)
+            return cost
+        self.add(result['phone_number'], False, error=result.get('error', 'Unknown error'))
+        return None
+
+    def __len__(self) -> int:
+        return self.successful + self.failed
+
+    def detail(self, i: int) -> Dict[str, Any]:
+        """Dict view of one recipient, in the shape send_single_sms returns"""
+        if self.status_codes[i] == STATUS_SUCCESS:
+            return {
+                'success': True,
+                'phone_number': self.phone_numbers[i],
+                'message_id': self.message_ids[i],
+                'cost': self.costs[i]
+            }
+        error_id = self.error_ids[i]
+        return {
+            'success': False,
+            'error': self.errors[error_id] if error_id != NO_ERROR else None,
+            'phone_number': self.phone_numbers[i]
+        }
+
+    def iter_details(self) -> Iterator[Dict[str, Any]]:
+        # Empty when only counters are kept
+        for i in range(len(self.phone_numbers)):
+            yield self.detail(i)
+
+    @property
+    def details(self) -> List[Dict[str, Any]]:
+        """All recipients as dicts; builds a new list on each access"""
+        return list(self.iter_details())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'successful': self.successful,
+            'failed': self.failed,
+            'total_cost': self.total_cost
+        }
+
+    def to_dict(self, include_details: bool = True) -> Dict[str, Any]:
+        data = self.summary()
+        if include_details:
+            data['details'] = self.details
+        return data
+
+    # Mapping-style access for callers written against the old results dict
+    def __getitem__(self, key: str) -> Any:
+        if key == 'details':
+            return self.details
+        if key in ('successful', 'failed', 'total_cost'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
@@ -0,0 +1,284 @@
+import math
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class SMSPriority(Enum):
+    TRANSACTIONAL = 'transactional'
+    NORMAL = 'normal'
+    BULK = 'bulk'
+
+
+# Relative share of the provider rate budget each lane gets when all are busy
+DEFAULT_LANE_WEIGHTS = {
+    SMSPriority.TRANSACTIONAL: 8,
+    SMSPriority.NORMAL: 3,
+    SMSPriority.BULK: 1,
+}
+
+
+class _Job:
+    __slots__ = ('func', 'args', 'route', 'future', 'enqueued_at', 'finish_tag')
+
+    def __init__(self, func: Callable, args: tuple, route: Optional[str], finish_tag: float):
+        self.func = func
+        self.args = args
+        self.route = route
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.finish_tag = finish_tag
+
+
+class _Lane:
+    """Queues and wait-time samples for a single priority class.
+
+    Jobs are kept in one FIFO sub-queue per route, so a throttled route only
+    holds back its own jobs; across routes, jobs leave in finish-tag order.
+    """
+
+    def __init__(self, priority: SMSPriority, weight: float, metrics_window: int):
+        self.priority = priority
+        self.weight = weight
+        self.queues = {}
+        self.queued = 0
+        self.last_finish = 0.0
+        self.dispatched = 0
+        self.waits = deque(maxlen=metrics_window)
+
+    def push(self, job: _Job):
+        self.queues.setdefault(job.route, deque()).append(job)
+        self.queued += 1
+
+    def pop(self, job: _Job):
+        queue = self.queues[job.route]
+        queue.popleft()
+        if not queue:
+            del self.queues[job.route]
+        self.queued -= 1
+
+    def drop_cancelled(self):
+        for route, queue in list(self.queues.items()):
+            while queue and queue[0].future.cancelled():
+                queue.popleft()
+                self.queued -= 1
+            if not queue:
+                del self.queues[route]
+
+
+class _RouteBucket:
+    """Token bucket limiting sends on one carrier route"""
+
+    def __init__(self, rate_per_second: float):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1.0, rate_per_second)
+        self.tokens = self.burst
+        self.dispatched = 0
+
+    def refill(self, elapsed: float):
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate_per_second)
+
+
+def _percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a sequence of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class PriorityScheduler:
+    """Dispatch sends from priority lanes under one shared provider rate budget.
+
+    Lanes are served with weighted fair queuing (virtual finish tags), and a
+    slice of the token bucket is held back so the transactional lane can always
+    dispatch immediately, even while a bulk broadcast is draining. Routes with a
+    rate in route_rates are additionally limited by their own token bucket.
+
+    Jobs leave their lane only when a worker is free to run them, so a slow
+    provider backs work up in the lanes, where the weights still apply,
+    rather than in the executor's FIFO queue.
+
+    The budget belongs to this scheduler only; processes that each build one
+    (e.g. gunicorn workers) must split the provider limit between them.
+    """
+
+    def __init__(self, rate_per_second: float = 10.0, burst: Optional[float] = None,
+                 reserved_fraction: float = 0.2, weights: Optional[Dict[SMSPriority, float]] = None,
+                 max_workers: int = 4, metrics_window: int = 1000,
+                 route_rates: Optional[Dict[str, float]] = None):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        if not 0 <= reserved_fraction < 1:
+            raise ValueError("reserved_fraction must be in [0, 1)")
+
+        self.rate_per_second = rate_per_second
+        self.burst = burst if burst is not None else max(1.0, rate_per_second)
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        # Lower lanes need reserved_tokens + 1 in the bucket, so the reserve is
+        # capped to leave room for that one token even at very low rates
+        self.reserved_tokens = min(self.burst * reserved_fraction, self.burst - 1.0)
+        self.max_workers = max_workers
+
+        weights = weights or DEFAULT_LANE_WEIGHTS
+        self._lanes = {
+            priority: _Lane(priority, weights.get(priority, 1), metrics_window)
+            for priority in SMSPriority
+        }
+        self._routes = {
+            route: _RouteBucket(rate) for route, rate in (route_rates or {}).items()
+        }
+        # Enum declaration order is highest priority first
+        self._top_priority = next(iter(SMSPriority))
+
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._virtual_time = 0.0
+        self._idle_workers = max_workers
+        self._executor = None
+        self._thread = None
+
+    def submit(self, priority: SMSPriority, func: Callable, *args, route: Optional[str] = None) -> Future:
+        """Queue func(*args) in the given lane and return a future for its result"""
+        with self._cond:
+            self._ensure_started()
+            lane = self._lanes[priority]
+            start = max(self._virtual_time, lane.last_finish)
+            job = _Job(func, args, route, start + 1.0 / lane.weight)
+            lane.last_finish = job.finish_tag
+            lane.push(job)
+            self._cond.notify()
+        return job.future
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and queue-wait percentiles (milliseconds) for every lane"""
+        with self._cond:
+            metrics = {}
+            for lane in self._lanes.values():
+                waits = list(lane.waits)
+                metrics[lane.priority.value] = {
+                    'weight': lane.weight,
+                    'queued': lane.queued,
+                    'dispatched': lane.dispatched,
+                    'wait_p50_ms': round(_percentile(waits, 50) * 1000, 2),
+                    'wait_p99_ms': round(_percentile(waits, 99) * 1000, 2),
+                    'wait_max_ms': round(max(waits, default=0.0) * 1000, 2),
+                }
+            return {
+                'rate_per_second': self.rate_per_second,
+                'reserved_tokens': self.reserved_tokens,
+                'busy_workers': self.max_workers - self._idle_workers,
+                'max_workers': self.max_workers,
+                'lanes': metrics,
+                'routes': {
+                    route: {'rate_per_second': bucket.rate_per_second, 'dispatched': bucket.dispatched}
+                    for route, bucket in self._routes.items()
+                },
+            }
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sms-send')
+            self._thread = threading.Thread(target=self._run, name='sms-scheduler', daemon=True)
+            self._thread.start()
+            logging.info(f"SMS scheduler started at {self.rate_per_second} msg/s")
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_second)
+        for bucket in self._routes.values():
+            bucket.refill(elapsed)
+        self._last_refill = now
+
+    def _tokens_needed(self, lane: _Lane) -> float:
+        # Lower lanes must leave the reserved tokens in the bucket
+        if lane.priority is self._top_priority:
+            return 1.0
+        return self.reserved_tokens + 1.0
+
+    def _pick_job(self) -> Optional[Tuple[_Lane, _Job]]:
+        """The dispatchable job with the earliest finish tag, skipping throttled routes"""
+        if self._idle_workers == 0:
+            return None
+        best = None
+        for lane in self._lanes.values():
+            # Cancelled sends are dropped without spending a token
+            lane.drop_cancelled()
+            if not lane.queued or self._tokens < self._tokens_needed(lane):
+                continue
+            for route, queue in lane.queues.items():
+                bucket = self._routes.get(route)
+                if bucket is not None and bucket.tokens < 1:
+                    continue
+                if best is None or queue[0].finish_tag < best[1].finish_tag:
+                    best = (lane, queue[0])
+        return best
+
+    def _wait_timeout(self) -> Optional[float]:
+        if self._idle_workers == 0:
+            # A finishing send notifies the dispatcher
+            return None
+        waits = []
+        for lane in self._lanes.values():
+            if not lane.queued:
+                continue
+            # The lane can move once it has tokens and any one of its routes does
+            route_wait = min(self._route_wait(route) for route in lane.queues)
+            waits.append(max(route_wait, (self._tokens_needed(lane) - self._tokens) / self.rate_per_second))
+        if not waits:
+            return None
+        return max(0.001, min(waits))
+
+    def _route_wait(self, route: Optional[str]) -> float:
+        bucket = self._routes.get(route)
+        if bucket is None:
+            return 0.0
+        return (1 - bucket.tokens) / bucket.rate_per_second
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    self._refill()
+                    picked = self._pick_job()
+                    if picked is not None:
+                        break
+                    self._cond.wait(self._wait_timeout())
+
+                lane, job = picked
+                lane.pop(job)
+                self._tokens -= 1
+                bucket = self._routes.get(job.route)
+                if bucket is not None:
+                    bucket.tokens -= 1
+                    bucket.dispatched += 1
+                self._virtual_time = job.finish_tag
+                self._idle_workers -= 1
+
+            self._executor.submit(self._execute, lane, job)
+
+    def _execute(self, lane: _Lane, job: _Job):
+        try:
+            if not job.future.set_running_or_notify_cancel():
+                return
+            with self._cond:
+                # Queue wait runs until the send actually starts
+                lane.dispatched += 1
+                lane.waits.append(time.monotonic() - job.enqueued_at)
+            try:
+                job.future.set_result(job.func(*job.args))
+            except Exception as e:
+                logging.error(f"Scheduled send failed: {str(e)}")
+                job.future.set_exception(e)
+        finally:
+            with self._cond:
+                self._idle_workers += 1
+                self._cond.notify()
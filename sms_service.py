@@ -1,8 +1,16 @@
 import os
 import logging
 import africastalking
-from typing import List, Dict, Any
-import time
+from collections import deque
+from contextlib import closing
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import Future
+from scheduler import PriorityScheduler, SMSPriority
+from results import BulkSendResults
+from numbering_plan import get_numbering_plan
+
+# Sends queued on the scheduler ahead of the one being collected
+SEND_WINDOW = 500
 
 class SMSService:
     """Service class for handling SMS operations using Africa's Talking API"""
@@ -20,6 +28,15 @@ class SMSService:
         except Exception as e:
             logging.error(f"Failed to initialize Africa's Talking: {str(e)}")
             self.sms = None
+        
+        # All bulk sends share one provider rate budget, split between priority lanes;
+        # carrier routes with a rate in the numbering plan are limited separately
+        self.numbering_plan = get_numbering_plan()
+        self.scheduler = PriorityScheduler(
+            rate_per_second=float(os.getenv('SMS_RATE_LIMIT', '10')),
+            reserved_fraction=float(os.getenv('SMS_TRANSACTIONAL_RESERVE', '0.2')),
+            route_rates=self.numbering_plan.route_rates
+        )
     
     def send_single_sms(self, message: str, phone_number: str) -> Dict[str, Any]:
         """Send SMS to a single phone number"""
@@ -68,129 +85,113 @@ class SMSService:
                 'phone_number': phone_number
             }
     
-    def send_bulk_sms(self, message: str, phone_numbers: List[str]) -> Dict[str, Any]:
+    def _iter_scheduled(self, message: str, phone_numbers: Iterable[str], priority: SMSPriority,
+                        prepare: Optional[Callable[[str], Any]] = None) -> Iterator[Tuple[str, Future, Any]]:
+        """Queue sends on the scheduler and yield (phone_number, future, prepared) in input order.
+
+        At most SEND_WINDOW sends are queued at once, so recipients can be
+        streamed from a generator without materializing the whole list.
+        prepare(phone_number), if given, runs before the send is queued and
+        its return value is yielded with it. Sends still queued when the
+        generator is closed early are cancelled, so nothing goes out that
+        the caller will not record.
+        """
+        pending = deque()
+        try:
+            for phone_number in phone_numbers:
+                prepared = prepare(phone_number) if prepare else None
+                route = self.numbering_plan.route_of(phone_number)
+                future = self.scheduler.submit(priority, self.send_single_sms, message, phone_number, route=route)
+                pending.append((phone_number, future, prepared))
+                if len(pending) >= SEND_WINDOW:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            for _, future, _ in pending:
+                future.cancel()
+    
+    def send_bulk_sms(self, message: str, phone_numbers: Iterable[str],
+                      priority: SMSPriority = SMSPriority.NORMAL) -> BulkSendResults:
         """Send SMS to multiple phone numbers with progress tracking"""
-        results = {
-            'successful': 0,
-            'failed': 0,
-            'details': [],
-            'total_cost': 0.0
-        }
+        results = BulkSendResults()
         
-        logging.info(f"Starting bulk SMS send to {len(phone_numbers)} numbers")
+        logging.info(f"Starting bulk SMS send ({priority.value} lane)")
         
-        for i, phone_number in enumerate(phone_numbers):
-            try:
-                # Send SMS
-                result = self.send_single_sms(message, phone_number)
-                results['details'].append(result)
-                
-                if result['success']:
-                    results['successful'] += 1
-                    # Extract cost if available
-                    cost_str = result.get('cost', '0')
-                    try:
-                        # Remove currency prefix and convert to float
-                        cost = float(cost_str.replace('KES', '').replace('USD', '').strip())
-                        results['total_cost'] += cost
-                    except (ValueError, AttributeError):
-                        pass
-                else:
-                    results['failed'] += 1
-                
-                # Small delay to avoid rate limiting
-                if i < len(phone_numbers) - 1:
-                    time.sleep(0.1)
-                
-                # Log progress every 10 messages
-                if (i + 1) % 10 == 0:
-                    logging.info(f"Processed {i + 1}/{len(phone_numbers)} messages")
+        # The scheduler paces sends against the shared rate budget
+        with closing(self._iter_scheduled(message, phone_numbers, priority)) as scheduled:
+            for i, (phone_number, future, _) in enumerate(scheduled):
+                try:
+                    results.add_result(future.result())
                     
-            except Exception as e:
-                logging.error(f"Error processing phone number {phone_number}: {str(e)}")
-                results['failed'] += 1
-                results['details'].append({
-                    'success': False,
-                    'error': str(e),
-                    'phone_number': phone_number
-                })
+                    # Log progress every 10 messages
+                    if (i + 1) % 10 == 0:
+                        logging.info(f"Processed {i + 1} messages")
+                        
+                except Exception as e:
+                    logging.error(f"Error processing phone number {phone_number}: {str(e)}")
+                    results.add(phone_number, False, error=str(e))
         
-        logging.info(f"Bulk SMS completed. Success: {results['successful']}, Failed: {results['failed']}")
+        logging.info(f"Bulk SMS completed. Success: {results.successful}, Failed: {results.failed}")
         return results
     
-    def send_bulk_sms_with_database(self, message: str, phone_numbers: List[str], campaign_id: int) -> Dict[str, Any]:
-        """Send SMS to multiple phone numbers with database logging"""
-        from datetime import datetime
+    def send_bulk_sms_with_database(self, message: str, phone_numbers: Iterable[str], campaign_id: int,
+                                    db, SMSRecord, SMSStatus,
+                                    priority: SMSPriority = SMSPriority.NORMAL) -> BulkSendResults:
+        """Send SMS to multiple phone numbers with database logging
         
-        results = {
-            'successful': 0,
-            'failed': 0,
-            'details': [],
-            'total_cost': 0.0
-        }
+        The caller passes in its SQLAlchemy db and the SMSRecord/SMSStatus
+        models the records are written with.
+        """
+        from datetime import datetime
         
-        logging.info(f"Starting bulk SMS send to {len(phone_numbers)} numbers for campaign {campaign_id}")
+        # Per-recipient outcomes go to sms_records, so only the counters are kept here
+        results = BulkSendResults(keep_details=False)
         
-        # Import here to avoid circular imports
-        from app import db, SMSRecord, SMSStatus
+        logging.info(f"Starting bulk SMS send for campaign {campaign_id} ({priority.value} lane)")
         
-        for i, phone_number in enumerate(phone_numbers):
-            # Create SMS record
+        def create_record(phone_number):
+            # Every send has a PENDING record before it is queued
             sms_record = SMSRecord()
             sms_record.campaign_id = campaign_id
             sms_record.phone_number = phone_number
             sms_record.status = SMSStatus.PENDING
             db.session.add(sms_record)
             db.session.flush()  # Get the record ID
-            
-            try:
-                # Send SMS
-                result = self.send_single_sms(message, phone_number)
-                results['details'].append(result)
-                
-                if result['success']:
-                    results['successful'] += 1
-                    sms_record.status = SMSStatus.SUCCESS
-                    sms_record.message_id = result.get('message_id')
-                    sms_record.sent_at = datetime.utcnow()
+            return sms_record
+        
+        # The scheduler paces sends against the shared rate budget; if anything
+        # here raises, sends not yet collected are cancelled
+        with closing(self._iter_scheduled(message, phone_numbers, priority, create_record)) as scheduled:
+            for i, (phone_number, future, sms_record) in enumerate(scheduled):
+                try:
+                    result = future.result()
+                    cost = results.add_result(result)
                     
-                    # Extract and store cost
-                    cost_str = result.get('cost', '0')
-                    try:
-                        cost = float(cost_str.replace('KES', '').replace('USD', '').strip())
-                        sms_record.cost = cost
-                        results['total_cost'] += cost
-                    except (ValueError, AttributeError):
-                        sms_record.cost = 0.0
-                else:
-                    results['failed'] += 1
-                    sms_record.status = SMSStatus.FAILED
-                    sms_record.error_message = result.get('error', 'Unknown error')
-                
-                # Small delay to avoid rate limiting
-                if i < len(phone_numbers) - 1:
-                    time.sleep(0.1)
-                
-                # Log progress every 10 messages
-                if (i + 1) % 10 == 0:
-                    logging.info(f"Processed {i + 1}/{len(phone_numbers)} messages")
-                    db.session.commit()  # Commit progress periodically
+                    if result['success']:
+                        sms_record.status = SMSStatus.SUCCESS
+                        sms_record.message_id = result.get('message_id')
+                        sms_record.sent_at = datetime.utcnow()
+                        sms_record.cost = cost if cost is not None else 0.0
+                    else:
+                        sms_record.status = SMSStatus.FAILED
+                        sms_record.error_message = result.get('error', 'Unknown error')
                     
-            except Exception as e:
-                logging.error(f"Error processing phone number {phone_number}: {str(e)}")
-                results['failed'] += 1
-                sms_record.status = SMSStatus.FAILED
-                sms_record.error_message = str(e)
-                results['details'].append({
-                    'success': False,
-                    'error': str(e),
-                    'phone_number': phone_number
-                })
+                    # Log progress every 10 messages
+                    if (i + 1) % 10 == 0:
+                        logging.info(f"Processed {i + 1} messages")
+                        db.session.commit()  # Commit progress periodically
+                        
+                except Exception as e:
+                    logging.error(f"Error processing phone number {phone_number}: {str(e)}")
+                    results.add(phone_number, False, error=str(e))
+                    sms_record.status = SMSStatus.FAILED
+                    sms_record.error_message = str(e)
         
         # Final commit
         db.session.commit()
         
-        logging.info(f"Bulk SMS completed. Success: {results['successful']}, Failed: {results['failed']}")
+        logging.info(f"Bulk SMS completed. Success: {results.successful}, Failed: {results.failed}")
         return results
     
     def get_service_status(self) -> Dict[str, Any]:
@@ -200,3 +201,7 @@ class SMSService:
             'username': self.username,
             'api_key_configured': bool(self.api_key and self.api_key != 'your-api-key-here')
         }
+    
+    def get_scheduler_metrics(self) -> Dict[str, Any]:
+        """Per-lane queue depth and queue-wait latency of the send scheduler"""
+        return self.scheduler.get_metrics()
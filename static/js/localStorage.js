@@ -1,124 +1,406 @@
-// localStorage Management for SMS Broadcasting App
-
-class LocalStorageManager {
+// Client-side storage for SMS Broadcasting App
+//
+// Campaigns live in IndexedDB: summaries are indexed by date and status for
+// cursor-based paging, per-recipient details are stored separately in a
+// compact columnar form, and daily/overall statistics are kept up to date
+// incrementally so nothing has to re-scan every campaign. Small settings stay
+// in localStorage.
+
+class CampaignStore {
     constructor() {
-        this.CAMPAIGNS_KEY = 'sms_campaigns';
-        this.STATISTICS_KEY = 'sms_statistics';
+        this.DB_NAME = 'sms_broadcasting';
+        this.DB_VERSION = 1;
         this.SETTINGS_KEY = 'sms_settings';
+
+        // Whole-blob keys used before the IndexedDB store; migrated on first open
+        this.LEGACY_CAMPAIGNS_KEY = 'sms_campaigns';
+        this.LEGACY_STATISTICS_KEY = 'sms_statistics';
+
+        this.dbPromise = null;
     }
 
-    // Campaign Management
-    saveCampaign(campaign) {
-        const campaigns = this.getCampaigns();
-        campaigns.unshift(campaign); // Add to beginning
-        
-        // Keep only last 100 campaigns
-        if (campaigns.length > 100) {
-            campaigns.splice(100);
+    // Database Setup
+    open() {
+        if (!this.dbPromise) {
+            this.dbPromise = new Promise((resolve, reject) => {
+                const request = indexedDB.open(this.DB_NAME, this.DB_VERSION);
+
+                request.onupgradeneeded = () => {
+                    const db = request.result;
+
+                    // Compound keys end with the id so every index key is unique and
+                    // can be used directly as a pagination cursor
+                    const campaigns = db.createObjectStore('campaigns', { keyPath: 'id' });
+                    campaigns.createIndex('created_at', ['created_at', 'id']);
+                    campaigns.createIndex('status', ['status', 'created_at', 'id']);
+
+                    db.createObjectStore('details', { keyPath: 'campaign_id' });
+                    db.createObjectStore('daily_stats', { keyPath: 'date' });
+                    db.createObjectStore('totals', { keyPath: 'key' });
+                };
+
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => reject(request.error);
+            }).then(db => this.migrateFromLocalStorage(db).then(() => db));
         }
-        
-        localStorage.setItem(this.CAMPAIGNS_KEY, JSON.stringify(campaigns));
-        this.updateDailyStatistics(campaign);
-        return campaign;
+        return this.dbPromise;
     }
 
-    getCampaigns() {
+    async migrateFromLocalStorage(db) {
+        const legacy = localStorage.getItem(this.LEGACY_CAMPAIGNS_KEY);
+        if (legacy === null) {
+            return;
+        }
+
         try {
-            return JSON.parse(localStorage.getItem(this.CAMPAIGNS_KEY) || '[]');
+            const campaigns = JSON.parse(legacy || '[]');
+            const tx = db.transaction(['campaigns', 'details', 'daily_stats', 'totals'], 'readwrite');
+            campaigns.forEach(campaign => this.writeCampaign(tx, campaign));
+            await CampaignStore.transactionDone(tx);
         } catch (error) {
-            console.error('Error loading campaigns:', error);
-            return [];
+            console.error('Error migrating campaigns from localStorage:', error);
+            return;
         }
+
+        localStorage.removeItem(this.LEGACY_CAMPAIGNS_KEY);
+        localStorage.removeItem(this.LEGACY_STATISTICS_KEY);
     }
 
-    getCampaignById(id) {
-        const campaigns = this.getCampaigns();
-        return campaigns.find(campaign => campaign.id === id);
+    static requestToPromise(request) {
+        return new Promise((resolve, reject) => {
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
     }
 
-    deleteCampaign(id) {
-        const campaigns = this.getCampaigns();
-        const filtered = campaigns.filter(campaign => campaign.id !== id);
-        localStorage.setItem(this.CAMPAIGNS_KEY, JSON.stringify(filtered));
-        this.recalculateStatistics();
+    static transactionDone(tx) {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = () => reject(tx.error);
+            tx.onabort = () => reject(tx.error);
+        });
     }
 
-    // Statistics Management
-    updateDailyStatistics(campaign) {
-        const today = new Date().toISOString().split('T')[0];
-        const stats = this.getStatistics();
-        
-        if (!stats[today]) {
-            stats[today] = {
-                date: today,
-                total_campaigns: 0,
-                total_messages_sent: 0,
-                total_successful: 0,
-                total_failed: 0,
-                total_cost: 0
-            };
+    // Campaign Management
+    static campaignStatus(campaign) {
+        if (campaign.failed_sends === 0) {
+            return 'success';
         }
-        
-        stats[today].total_campaigns += 1;
-        stats[today].total_messages_sent += campaign.total_recipients;
-        stats[today].total_successful += campaign.successful_sends;
-        stats[today].total_failed += campaign.failed_sends;
-        stats[today].total_cost += campaign.total_cost;
-        
-        localStorage.setItem(this.STATISTICS_KEY, JSON.stringify(stats));
+        return campaign.successful_sends > 0 ? 'partial' : 'failed';
     }
 
-    getStatistics() {
-        try {
-            return JSON.parse(localStorage.getItem(this.STATISTICS_KEY) || '{}');
-        } catch (error) {
-            console.error('Error loading statistics:', error);
-            return {};
+    writeCampaign(tx, campaign) {
+        const { details = [], ...fields } = campaign;
+        const summary = {
+            ...fields,
+            id: String(campaign.id),
+            // Normalize to UTC ISO strings so index order matches time order
+            created_at: new Date(campaign.created_at || Date.now()).toISOString()
+        };
+        summary.status = CampaignStore.campaignStatus(summary);
+
+        const campaigns = tx.objectStore('campaigns');
+        campaigns.get(summary.id).onsuccess = event => {
+            // Re-saving a campaign replaces its previous contribution to the statistics
+            if (event.target.result) {
+                this.applyToStatistics(tx, event.target.result, -1);
+            }
+            campaigns.put(summary);
+            tx.objectStore('details').put({ campaign_id: summary.id, ...CampaignStore.compactDetails(details) });
+            this.applyToStatistics(tx, summary, 1);
+        };
+        return summary;
+    }
+
+    async saveCampaign(campaign) {
+        const db = await this.open();
+        const tx = db.transaction(['campaigns', 'details', 'daily_stats', 'totals'], 'readwrite');
+        const summary = this.writeCampaign(tx, campaign);
+        await CampaignStore.transactionDone(tx);
+        return summary;
+    }
+
+    async getCampaignById(id) {
+        const db = await this.open();
+        const store = db.transaction('campaigns').objectStore('campaigns');
+        return CampaignStore.requestToPromise(store.get(String(id)));
+    }
+
+    async getCampaignDetails(id) {
+        const db = await this.open();
+        const store = db.transaction('details').objectStore('details');
+        const compact = await CampaignStore.requestToPromise(store.get(String(id)));
+        return compact ? CampaignStore.expandDetails(compact) : [];
+    }
+
+    async deleteCampaign(id) {
+        const db = await this.open();
+        const tx = db.transaction(['campaigns', 'details', 'daily_stats', 'totals'], 'readwrite');
+        this.removeCampaign(tx, String(id));
+        await CampaignStore.transactionDone(tx);
+    }
+
+    removeCampaign(tx, id) {
+        tx.objectStore('campaigns').get(id).onsuccess = event => {
+            const campaign = event.target.result;
+            if (!campaign) {
+                return;
+            }
+            tx.objectStore('campaigns').delete(id);
+            tx.objectStore('details').delete(id);
+            this.applyToStatistics(tx, campaign, -1);
+        };
+    }
+
+    // Compact Details
+    // One array per field instead of one object per recipient; statuses are
+    // 0/1 bytes and each distinct error string is stored once.
+    static compactDetails(details) {
+        const errors = [];
+        const errorIds = new Map();
+        const compact = {
+            phone_numbers: [],
+            message_ids: [],
+            costs: [],
+            status: new Uint8Array(details.length),
+            error_ids: new Int32Array(details.length),
+            errors: errors
+        };
+
+        details.forEach((detail, i) => {
+            compact.phone_numbers.push(detail.phone_number);
+            compact.message_ids.push(detail.message_id || null);
+            compact.costs.push(detail.cost || null);
+            compact.status[i] = detail.success ? 1 : 0;
+
+            let errorId = -1;
+            if (detail.error) {
+                if (!errorIds.has(detail.error)) {
+                    errorIds.set(detail.error, errors.length);
+                    errors.push(detail.error);
+                }
+                errorId = errorIds.get(detail.error);
+            }
+            compact.error_ids[i] = errorId;
+        });
+
+        return compact;
+    }
+
+    static expandDetails(compact) {
+        return compact.phone_numbers.map((phone_number, i) => {
+            const detail = { success: compact.status[i] === 1, phone_number: phone_number };
+            if (compact.message_ids[i]) detail.message_id = compact.message_ids[i];
+            if (compact.costs[i]) detail.cost = compact.costs[i];
+            if (compact.error_ids[i] >= 0) detail.error = compact.errors[compact.error_ids[i]];
+            return detail;
+        });
+    }
+
+    // Paging and Search
+    static pageRange(status, since, cursor) {
+        const lower = status ? [status, since || ''] : (since ? [since] : null);
+        let upper = null;
+        if (cursor) {
+            upper = status ? [status, ...cursor] : cursor;
+        } else if (status) {
+            upper = [status, '\uffff'];
         }
+
+        if (lower && upper) return IDBKeyRange.bound(lower, upper, false, !!cursor);
+        if (lower) return IDBKeyRange.lowerBound(lower);
+        if (upper) return IDBKeyRange.upperBound(upper, !!cursor);
+        return null;
+    }
+
+    static sinceDays(days) {
+        if (!days || days === 'all') {
+            return null;
+        }
+        const cutoff = new Date();
+        cutoff.setDate(cutoff.getDate() - parseInt(days));
+        return cutoff.toISOString();
+    }
+
+    // Newest-first page of campaigns. Pass the returned nextCursor back in to
+    // get the following page; it is null once there is nothing more to load.
+    async getCampaignPage({ status = '', since = null, query = '', cursor = null, limit = 20 } = {}) {
+        const db = await this.open();
+        const store = db.transaction('campaigns').objectStore('campaigns');
+        const index = store.index(status ? 'status' : 'created_at');
+        const needle = query.toLowerCase();
+        const campaigns = [];
+
+        return new Promise((resolve, reject) => {
+            const request = index.openCursor(CampaignStore.pageRange(status, since, cursor), 'prev');
+
+            request.onsuccess = () => {
+                const current = request.result;
+                if (!current) {
+                    resolve({ campaigns: campaigns, nextCursor: null });
+                    return;
+                }
+
+                const campaign = current.value;
+                if (!needle ||
+                    campaign.message.toLowerCase().includes(needle) ||
+                    campaign.id.toLowerCase().includes(needle)) {
+                    // Read one past the page to know whether another page exists
+                    if (campaigns.length === limit) {
+                        const last = campaigns[campaigns.length - 1];
+                        resolve({ campaigns: campaigns, nextCursor: [last.created_at, last.id] });
+                        return;
+                    }
+                    campaigns.push(campaign);
+                }
+                current.continue();
+            };
+            request.onerror = () => reject(request.error);
+        });
+    }
+
+    async countCampaigns({ status = '', since = null } = {}) {
+        const db = await this.open();
+        const store = db.transaction('campaigns').objectStore('campaigns');
+        const index = store.index(status ? 'status' : 'created_at');
+        return CampaignStore.requestToPromise(index.count(CampaignStore.pageRange(status, since, null)));
+    }
+
+    async searchCampaigns(query, limit = 50) {
+        const page = await this.getCampaignPage({ query: query, limit: limit });
+        return page.campaigns;
     }
 
-    getDailyStatistics(days = 30) {
-        const stats = this.getStatistics();
-        const dates = Object.keys(stats).sort().reverse().slice(0, days);
-        return dates.map(date => stats[date]);
+    async filterCampaignsByDate(startDate, endDate, limit = 50) {
+        const db = await this.open();
+        const index = db.transaction('campaigns').objectStore('campaigns').index('created_at');
+        const range = IDBKeyRange.bound([new Date(startDate).toISOString()], [new Date(endDate).toISOString(), '\uffff']);
+        return CampaignStore.requestToPromise(index.getAll(range, limit));
     }
 
-    getOverallStatistics() {
-        const campaigns = this.getCampaigns();
-        
-        const overall = {
-            total_campaigns: campaigns.length,
-            total_messages: 0,
+    async filterCampaignsByStatus(status, limit = 50) {
+        const page = await this.getCampaignPage({ status: status, limit: limit });
+        return page.campaigns;
+    }
+
+    // Statistics Management
+    static emptyStatistics(fields) {
+        return {
+            ...fields,
+            total_campaigns: 0,
+            total_messages_sent: 0,
             total_successful: 0,
             total_failed: 0,
             total_cost: 0
         };
+    }
 
-        campaigns.forEach(campaign => {
-            overall.total_messages += campaign.total_recipients;
-            overall.total_successful += campaign.successful_sends;
-            overall.total_failed += campaign.failed_sends;
-            overall.total_cost += campaign.total_cost;
-        });
+    applyToStatistics(tx, campaign, sign) {
+        const apply = stats => {
+            stats.total_campaigns += sign;
+            stats.total_messages_sent += sign * (campaign.total_recipients || 0);
+            stats.total_successful += sign * (campaign.successful_sends || 0);
+            stats.total_failed += sign * (campaign.failed_sends || 0);
+            stats.total_cost += sign * (campaign.total_cost || 0);
+        };
+
+        const date = campaign.created_at.split('T')[0];
+        this.updateStatisticsRow(tx, 'daily_stats', date, { date: date }, apply);
+        this.updateStatisticsRow(tx, 'totals', 'overall', { key: 'overall' }, apply);
+    }
+
+    // Several campaigns in one transaction can touch the same row, so each row
+    // is read once per transaction and later updates queue behind that read
+    updateStatisticsRow(tx, storeName, key, fields, apply) {
+        if (!tx.statisticsRows) {
+            tx.statisticsRows = new Map();
+        }
+        const rowKey = `${storeName}:${key}`;
+        const store = tx.objectStore(storeName);
+        const write = row => {
+            if (storeName === 'daily_stats' && row.stats.total_campaigns <= 0) {
+                store.delete(key);
+            } else {
+                store.put(row.stats);
+            }
+        };
 
-        overall.success_rate = overall.total_messages > 0 
-            ? (overall.total_successful / overall.total_messages * 100) 
-            : 0;
+        let row = tx.statisticsRows.get(rowKey);
+        if (row && row.stats) {
+            apply(row.stats);
+            write(row);
+            return;
+        }
+        if (row) {
+            row.pending.push(apply);
+            return;
+        }
 
-        return overall;
+        row = { stats: null, pending: [apply] };
+        tx.statisticsRows.set(rowKey, row);
+        store.get(key).onsuccess = event => {
+            row.stats = event.target.result || CampaignStore.emptyStatistics(fields);
+            row.pending.forEach(pendingApply => pendingApply(row.stats));
+            row.pending = [];
+            write(row);
+        };
     }
 
-    recalculateStatistics() {
-        // Clear existing statistics
-        localStorage.removeItem(this.STATISTICS_KEY);
-        
-        // Recalculate from campaigns
-        const campaigns = this.getCampaigns();
-        campaigns.forEach(campaign => {
-            this.updateDailyStatistics(campaign);
+    async getDailyStatistics(days = 30) {
+        const db = await this.open();
+        const store = db.transaction('daily_stats').objectStore('daily_stats');
+        const stats = [];
+
+        return new Promise((resolve, reject) => {
+            const request = store.openCursor(null, 'prev');
+            request.onsuccess = () => {
+                const current = request.result;
+                if (!current || stats.length >= days) {
+                    resolve(stats);
+                    return;
+                }
+                stats.push(current.value);
+                current.continue();
+            };
+            request.onerror = () => reject(request.error);
         });
     }
 
+    async getOverallStatistics() {
+        const db = await this.open();
+        const store = db.transaction('totals').objectStore('totals');
+        const totals = await CampaignStore.requestToPromise(store.get('overall')) ||
+            CampaignStore.emptyStatistics({ key: 'overall' });
+
+        return {
+            total_campaigns: totals.total_campaigns,
+            total_messages: totals.total_messages_sent,
+            total_successful: totals.total_successful,
+            total_failed: totals.total_failed,
+            total_cost: totals.total_cost,
+            success_rate: totals.total_messages_sent > 0
+                ? (totals.total_successful / totals.total_messages_sent * 100)
+                : 0
+        };
+    }
+
+    // Rebuilds statistics from scratch; only needed to repair drift
+    async recalculateStatistics() {
+        const db = await this.open();
+        const tx = db.transaction(['campaigns', 'daily_stats', 'totals'], 'readwrite');
+        tx.objectStore('daily_stats').clear();
+        tx.objectStore('totals').clear();
+
+        tx.objectStore('campaigns').openCursor().onsuccess = event => {
+            const current = event.target.result;
+            if (current) {
+                this.applyToStatistics(tx, current.value, 1);
+                current.continue();
+            }
+        };
+        await CampaignStore.transactionDone(tx);
+    }
+
     // Settings Management
     saveSettings(settings) {
         const currentSettings = this.getSettings();
@@ -137,22 +419,37 @@ class LocalStorageManager {
     }
 
     // Data Export/Import
-    exportData() {
+    async exportData() {
+        const db = await this.open();
+        const tx = db.transaction(['campaigns', 'details', 'daily_stats']);
+        const [campaigns, details, dailyStats] = await Promise.all([
+            CampaignStore.requestToPromise(tx.objectStore('campaigns').getAll()),
+            CampaignStore.requestToPromise(tx.objectStore('details').getAll()),
+            CampaignStore.requestToPromise(tx.objectStore('daily_stats').getAll())
+        ]);
+
+        const detailsById = new Map(details.map(compact => [compact.campaign_id, compact]));
+        const statistics = {};
+        dailyStats.forEach(stats => { statistics[stats.date] = stats; });
+
         return {
-            campaigns: this.getCampaigns(),
-            statistics: this.getStatistics(),
+            campaigns: campaigns.reverse().map(campaign => ({
+                ...campaign,
+                details: detailsById.has(campaign.id) ? CampaignStore.expandDetails(detailsById.get(campaign.id)) : []
+            })),
+            statistics: statistics,
             settings: this.getSettings(),
             exported_at: new Date().toISOString()
         };
     }
 
-    importData(data) {
+    async importData(data) {
         try {
             if (data.campaigns) {
-                localStorage.setItem(this.CAMPAIGNS_KEY, JSON.stringify(data.campaigns));
-            }
-            if (data.statistics) {
-                localStorage.setItem(this.STATISTICS_KEY, JSON.stringify(data.statistics));
+                const db = await this.open();
+                const tx = db.transaction(['campaigns', 'details', 'daily_stats', 'totals'], 'readwrite');
+                data.campaigns.forEach(campaign => this.writeCampaign(tx, campaign));
+                await CampaignStore.transactionDone(tx);
             }
             if (data.settings) {
                 localStorage.setItem(this.SETTINGS_KEY, JSON.stringify(data.settings));
@@ -165,104 +462,72 @@ class LocalStorageManager {
     }
 
     // Data Cleanup
-    clearAllData() {
-        localStorage.removeItem(this.CAMPAIGNS_KEY);
-        localStorage.removeItem(this.STATISTICS_KEY);
+    async clearAllData() {
+        const db = await this.open();
+        const stores = ['campaigns', 'details', 'daily_stats', 'totals'];
+        const tx = db.transaction(stores, 'readwrite');
+        stores.forEach(name => tx.objectStore(name).clear());
+        await CampaignStore.transactionDone(tx);
         localStorage.removeItem(this.SETTINGS_KEY);
     }
 
-    clearOldData(daysToKeep = 90) {
-        const campaigns = this.getCampaigns();
-        const cutoffDate = new Date();
-        cutoffDate.setDate(cutoffDate.getDate() - daysToKeep);
-
-        const filteredCampaigns = campaigns.filter(campaign => {
-            const campaignDate = new Date(campaign.created_at);
-            return campaignDate > cutoffDate;
-        });
-
-        localStorage.setItem(this.CAMPAIGNS_KEY, JSON.stringify(filteredCampaigns));
-        this.recalculateStatistics();
+    async clearOldData(daysToKeep = 90) {
+        const db = await this.open();
+        const tx = db.transaction(['campaigns', 'details', 'daily_stats', 'totals'], 'readwrite');
+        const cutoff = CampaignStore.sinceDays(daysToKeep);
+
+        // Only walks the expired range of the date index
+        const index = tx.objectStore('campaigns').index('created_at');
+        index.openCursor(IDBKeyRange.upperBound([cutoff], true)).onsuccess = event => {
+            const current = event.target.result;
+            if (current) {
+                this.removeCampaign(tx, current.primaryKey);
+                current.continue();
+            }
+        };
+        await CampaignStore.transactionDone(tx);
     }
 
     // Storage Info
-    getStorageInfo() {
-        const campaigns = this.getCampaigns();
-        const statistics = this.getStatistics();
-        const settings = this.getSettings();
+    async getStorageInfo() {
+        const [campaignsCount, dailyStats, latest] = await Promise.all([
+            this.countCampaigns(),
+            this.getDailyStatistics(Infinity),
+            this.getCampaignPage({ limit: 1 })
+        ]);
+        const estimate = navigator.storage && navigator.storage.estimate
+            ? await navigator.storage.estimate()
+            : {};
 
         return {
-            campaigns_count: campaigns.length,
-            statistics_days: Object.keys(statistics).length,
-            storage_size: this.getStorageSize(),
-            last_campaign: campaigns.length > 0 ? campaigns[0].created_at : null
+            campaigns_count: campaignsCount,
+            statistics_days: dailyStats.length,
+            storage_size: estimate.usage || 0,
+            storage_quota: estimate.quota || null,
+            last_campaign: latest.campaigns.length > 0 ? latest.campaigns[0].created_at : null
         };
     }
-
-    getStorageSize() {
-        let total = 0;
-        for (let key in localStorage) {
-            if (localStorage.hasOwnProperty(key) && key.startsWith('sms_')) {
-                total += localStorage[key].length;
-            }
-        }
-        return total;
-    }
-
-    // Search and Filter
-    searchCampaigns(query) {
-        const campaigns = this.getCampaigns();
-        const lowerQuery = query.toLowerCase();
-
-        return campaigns.filter(campaign => 
-            campaign.message.toLowerCase().includes(lowerQuery) ||
-            campaign.id.toLowerCase().includes(lowerQuery)
-        );
-    }
-
-    filterCampaignsByDate(startDate, endDate) {
-        const campaigns = this.getCampaigns();
-        const start = new Date(startDate);
-        const end = new Date(endDate);
-
-        return campaigns.filter(campaign => {
-            const campaignDate = new Date(campaign.created_at);
-            return campaignDate >= start && campaignDate <= end;
-        });
-    }
-
-    filterCampaignsByStatus(status) {
-        const campaigns = this.getCampaigns();
-        
-        return campaigns.filter(campaign => {
-            if (status === 'success') {
-                return campaign.failed_sends === 0;
-            } else if (status === 'partial') {
-                return campaign.successful_sends > 0 && campaign.failed_sends > 0;
-            } else if (status === 'failed') {
-                return campaign.successful_sends === 0;
-            }
-            return true;
-        });
-    }
 }
 
 // Create global instance
-window.localStorageManager = new LocalStorageManager();
+window.campaignStore = new CampaignStore();
 
-// Utility functions for easy access
+// Utility functions for easy access; all return promises
 window.smsStorage = {
-    saveCampaign: (campaign) => window.localStorageManager.saveCampaign(campaign),
-    getCampaigns: () => window.localStorageManager.getCampaigns(),
-    getOverallStats: () => window.localStorageManager.getOverallStatistics(),
-    getDailyStats: (days) => window.localStorageManager.getDailyStatistics(days),
-    searchCampaigns: (query) => window.localStorageManager.searchCampaigns(query),
-    exportData: () => window.localStorageManager.exportData(),
-    clearData: () => window.localStorageManager.clearAllData()
+    saveCampaign: (campaign) => window.campaignStore.saveCampaign(campaign),
+    getCampaignPage: (options) => window.campaignStore.getCampaignPage(options),
+    countCampaigns: (options) => window.campaignStore.countCampaigns(options),
+    getCampaign: (id) => window.campaignStore.getCampaignById(id),
+    getCampaignDetails: (id) => window.campaignStore.getCampaignDetails(id),
+    getOverallStats: () => window.campaignStore.getOverallStatistics(),
+    getDailyStats: (days) => window.campaignStore.getDailyStatistics(days),
+    searchCampaigns: (query) => window.campaignStore.searchCampaigns(query),
+    exportData: () => window.campaignStore.exportData(),
+    clearData: () => window.campaignStore.clearAllData()
 };
 
 // Auto-cleanup old data on page load
 document.addEventListener('DOMContentLoaded', () => {
     // Clean up data older than 90 days
-    window.localStorageManager.clearOldData(90);
-});
\ No newline at end of file
+    window.campaignStore.clearOldData(90).catch(error => console.error('Error cleaning up campaigns:', error));
+});
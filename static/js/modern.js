@@ -249,7 +249,8 @@ class ModernSMSApp {
             // Prepare data
             const formData = {
                 message: message,
-                phone_numbers: phoneNumbers
+                phone_numbers: phoneNumbers,
+                priority: document.getElementById('priority')?.value || 'normal'
             };
 
             // Send request
@@ -264,7 +265,7 @@ class ModernSMSApp {
             const result = await response.json();
 
             if (result.success) {
-                // Save to localStorage
+                // Save to the campaign store
                 this.saveCampaignToStorage(result.campaign);
                 
                 // Show results
@@ -441,42 +442,9 @@ class ModernSMSApp {
     }
 
     saveCampaignToStorage(campaign) {
-        const campaigns = JSON.parse(localStorage.getItem('sms_campaigns') || '[]');
-        campaigns.unshift(campaign); // Add to beginning
-        
-        // Keep only last 100 campaigns
-        if (campaigns.length > 100) {
-            campaigns.splice(100);
-        }
-        
-        localStorage.setItem('sms_campaigns', JSON.stringify(campaigns));
-        
-        // Update statistics
-        this.updateStatistics(campaign);
-    }
-
-    updateStatistics(campaign) {
-        const today = new Date().toISOString().split('T')[0];
-        const stats = JSON.parse(localStorage.getItem('sms_statistics') || '{}');
-        
-        if (!stats[today]) {
-            stats[today] = {
-                date: today,
-                total_campaigns: 0,
-                total_messages_sent: 0,
-                total_successful: 0,
-                total_failed: 0,
-                total_cost: 0
-            };
-        }
-        
-        stats[today].total_campaigns += 1;
-        stats[today].total_messages_sent += campaign.total_recipients;
-        stats[today].total_successful += campaign.successful_sends;
-        stats[today].total_failed += campaign.failed_sends;
-        stats[today].total_cost += campaign.total_cost;
-        
-        localStorage.setItem('sms_statistics', JSON.stringify(stats));
+        // Statistics are updated by the store in the same transaction
+        window.smsStorage.saveCampaign(campaign)
+            .catch(error => console.error('Error saving campaign:', error));
     }
 }
 
@@ -1,63 +1,90 @@
 import re
 import csv
 import io
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from numbering_plan import NumberInfo, get_numbering_plan
 
 def clean_phone_number(phone_number: str) -> str:
     """Clean and format phone number"""
+    return get_numbering_plan().normalize(phone_number)
+
+def classify_phone_number(phone_number: str) -> Optional[NumberInfo]:
+    """Clean, validate and tag a phone number with its country, carrier and route, or None if invalid"""
     if not phone_number:
-        return ""
-    
-    # Remove all non-digit characters except +
-    cleaned = re.sub(r'[^\d+]', '', phone_number.strip())
-    
-    # Handle different formats
-    if cleaned.startswith('0'):
-        # Remove leading zero and add Ghana country code
-        cleaned = '+233' + cleaned[1:]
-    elif cleaned.startswith('233'):
-        # Add + if missing
-        cleaned = '+' + cleaned
-    elif not cleaned.startswith('+'):
-        # Assume Ghana number if no country code
-        if len(cleaned) == 9:
-            cleaned = '+233' + cleaned
-    
-    return cleaned
+        return None
+    return get_numbering_plan().classify(phone_number)
 
 def validate_phone_numbers(phone_numbers: List[str]) -> tuple:
     """Validate a list of phone numbers and return valid and invalid numbers"""
     if not phone_numbers:
         return [], []
     
-    # Ghana phone number pattern
-    ghana_pattern = r'^\+233[2-5]\d{8}$'
-    
+    plan = get_numbering_plan()
     valid_numbers = []
     invalid_numbers = []
     
     for number in phone_numbers:
         if not number:
             continue
-            
-        # Clean the number first
-        cleaned_number = clean_phone_number(number)
         
-        if re.match(ghana_pattern, cleaned_number):
-            valid_numbers.append(cleaned_number)
+        # One trie lookup both validates and classifies the number
+        info = plan.classify(number)
+        if info is not None:
+            valid_numbers.append(info.e164)
         else:
             invalid_numbers.append(number)
     
     return valid_numbers, invalid_numbers
 
+def normalize_phone_number(phone_number: str) -> Optional[str]:
+    """Clean a phone number and return it in canonical form, or None if it is invalid"""
+    info = classify_phone_number(phone_number)
+    return info.e164 if info else None
+
 def validate_single_phone_number(phone_number: str) -> bool:
     """Validate a single phone number"""
-    if not phone_number:
+    if not phone_number or not phone_number.startswith('+'):
         return False
-    
-    # Ghana phone number pattern
-    ghana_pattern = r'^\+233[2-5]\d{8}$'
-    return bool(re.match(ghana_pattern, phone_number))
+    return get_numbering_plan().lookup(phone_number[1:]) is not None
+
+def starts_with_international_number(text: str) -> bool:
+    """Check whether text starts with +<known country code>, i.e. is a typed number rather than CSV"""
+    text = text.strip()
+    if not text.startswith('+'):
+        return False
+    return any(text[1:].startswith(country['country_code'])
+               for country in get_numbering_plan().countries.values())
+
+def summarize_routes(phone_numbers: Iterable[str], message: str) -> dict:
+    """Recipients, message parts and (where priced) estimated cost per send route for normalized numbers"""
+    plan = get_numbering_plan()
+    parts = count_sms_parts(message)
+    summary = {}
+    for route, numbers in plan.group_by_route(phone_numbers).items():
+        summary[route] = {
+            'recipients': len(numbers),
+            'sms_parts': len(numbers) * parts
+        }
+        # Only routes with a cost_per_part in the plan get an estimate
+        estimated_cost = plan.estimate_cost(route, len(numbers) * parts)
+        if estimated_cost is not None:
+            summary[route]['estimated_cost'] = estimated_cost
+    return summary
+
+def iter_csv_phone_numbers(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the first phone number found in each CSV row, one row at a time"""
+    for row in csv.reader(lines):
+        if not row:
+            continue
+            
+        # Try each column to find phone numbers
+        for cell in row:
+            if cell and cell.strip():
+                # Check if this looks like a phone number
+                cleaned_cell = re.sub(r'[^\d+]', '', cell.strip())
+                if len(cleaned_cell) >= 9:  # Minimum phone number length
+                    yield cell.strip()
+                    break  # Only take first valid phone number per row
 
 def parse_csv_content(csv_content: str) -> List[str]:
     """Parse CSV content and extract phone numbers"""
@@ -65,20 +92,7 @@ def parse_csv_content(csv_content: str) -> List[str]:
     
     try:
         # Try to parse as CSV
-        csv_reader = csv.reader(io.StringIO(csv_content))
-        
-        for row_num, row in enumerate(csv_reader, 1):
-            if not row:
-                continue
-                
-            # Try each column to find phone numbers
-            for cell in row:
-                if cell and cell.strip():
-                    # Check if this looks like a phone number
-                    cleaned_cell = re.sub(r'[^\d+]', '', cell.strip())
-                    if len(cleaned_cell) >= 9:  # Minimum phone number length
-                        phone_numbers.append(cell.strip())
-                        break  # Only take first valid phone number per row
+        phone_numbers.extend(iter_csv_phone_numbers(io.StringIO(csv_content)))
     
     except Exception as e:
         # If CSV parsing fails, try to extract phone numbers from plain text
@@ -115,12 +129,13 @@ def format_phone_number_for_display(phone_number: str) -> str:
     if not phone_number:
         return ""
     
-    # Remove + and format as XXX XXX XXXX
+    # Remove + and format as +CCC XXX XXX XXX
     digits = re.sub(r'[^\d]', '', phone_number)
+    entry = get_numbering_plan().lookup(digits)
     
-    if len(digits) >= 12 and digits.startswith('233'):
-        # Ghana format: +233 XXX XXX XXX
-        return f"+233 {digits[3:6]} {digits[6:9]} {digits[9:]}"
+    if entry is not None:
+        national = digits[len(entry.country_code):]
+        return f"+{entry.country_code} {national[:3]} {national[3:6]} {national[6:]}"
     
     return phone_number
 